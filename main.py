@@ -1,120 +1,403 @@
+import contextlib
+import functools
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import json
-from pydantic import BaseModel, EmailStr, ValidationError
-from openai import OpenAI
-from datetime import datetime
-import ics
-from dateutil import parser
-import pytz
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    # orjson is an optional, faster drop-in for the dumps/loads calls used here
+    import orjson as _json
+except ImportError:
+    import json as _json
+try:
+    # ciso8601 is an optional C parser for ISO 8601 timestamps, tried before the strptime formats
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = None
+from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from typing import List, Dict, Optional, Tuple
 
 # API configuration parameters
 GRANT_ID = "<GRANT_ID>"
 API_KEY = "<API_KEY>"
 CALENDAR_ID = "<CALENDAR_ID>"
 
+# Cheap syntactic check for participant emails before they are attached to an event
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Month names and abbreviations, shared by the month-first and day-first date patterns below
+_MONTHS = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+
+# Cheap check for a plausible date or time token, so text that can't describe an event never reaches OpenAI
+# Every English word is anchored on both sides so "amazing" or "nextcloud" don't count; bare am/pm only count after a number
+_TIME_HINT_RE = re.compile(
+    r"\d{1,2}[:：.]\d{2}|\d{1,2}\s*[ap]\.?m\b|\d+\s*(?:min(?:ute)?s?|h(?:ou)?rs?)\b|o'clock|\b\d{1,2}(?:st|nd|rd|th)\b|\bat\s+\d{1,2}\b"
+    r"|\b(?:noon|midnight|morning|afternoon|evening|night|today|tonight|tomorrow|next|week|weekend"
+    r"|mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:rs(?:day)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)s?\b"
+    r"|\b" + _MONTHS + r"\.?\s+\d{1,2}\b|\b\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTHS + r"\b"
+    r"|\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}"
+    r"|[\d一二三四五六七八九十]+月[\d一二三四五六七八九十]+[日号]|[\d一二三四五六七八九十两]+点"
+    r"|明天|今天|后天|下周|周[一二三四五六日天]|星期|上午|中午|下午|晚上|早上|分钟|小时",
+    re.IGNORECASE
+)
+
+# Time formats tried with strptime before falling back to dateutil's fuzzy parser
+_FAST_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M")
+
+def _json_bytes(obj) -> bytes:
+    # orjson.dumps already returns bytes; the stdlib fallback returns str
+    data = _json.dumps(obj)
+    return data if isinstance(data, bytes) else data.encode()
+
+def _check_description(description: str) -> None:
+    # Raises ValueError for descriptions that are blank or mention no date/time, saving an OpenAI round trip
+    if not description or not description.strip():
+        raise ValueError("Event description is empty")
+    if not _TIME_HINT_RE.search(description):
+        raise ValueError("Event description does not mention a date or time")
+
+def _parse_time(time_str: str, today: date) -> datetime:
+    # Well-formed timestamps go through ciso8601 or strptime; anything else falls back to dateutil's fuzzy parser, filling missing fields from today
+    if _parse_iso is not None:
+        try:
+            return _parse_iso(time_str)
+        except ValueError:
+            pass
+    for fmt in _FAST_FORMATS:
+        try:
+            return datetime.strptime(time_str, fmt)
+        except ValueError:
+            continue
+    from dateutil import parser
+    return parser.parse(time_str, fuzzy=True, default=datetime.combine(today, datetime.min.time()))
+
+@functools.lru_cache(maxsize=1024)
+def _standardize_time(time_str: str, tz: ZoneInfo, today: date) -> int:
+    # Cached per (input, timezone, day): relative inputs like "Tuesday at 9:30" resolve against today, so the day is part of the key
+    parsed_time = _parse_time(time_str, today)
+    # zoneinfo tzinfos can be attached directly (no pytz localize), and timestamp() does the UTC conversion itself
+    if parsed_time.tzinfo is None:
+        parsed_time = parsed_time.replace(tzinfo=tz)
+    return int(parsed_time.timestamp())
+
+class _NylasRetry(Retry):
+    # POSTs (create_event) are only retried when Nylas refused them outright with 429/503; after a 502/504 or a read error the event may
+    # already have been created, and replaying the POST would create a duplicate and re-send the invitations
+    POST_RETRY_STATUSES = frozenset({429, 503})
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code in self.POST_RETRY_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
 # NylasAPI class handles interactions with the Nylas API, such as retrieving calendars and creating events
 class NylasAPI:
     def __init__(self, grant_id: str, api_key: str):
         self.grant_id = grant_id
         self.api_key = api_key
-
-    def _get_headers(self) -> Dict[str, str]:
-        # Returns the necessary headers for authentication with the Nylas API
-        return {
-            'Authorization': f'Bearer {self.api_key}',
+        # The authentication headers never change for a client, so they are built once and carried by the session
+        self._headers = {
+            'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
         }
+        # A single session keeps the connection to the Nylas host alive across calls instead of a new TCP+TLS handshake per request
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        # Transient rate limits and gateway errors are retried up to 3 times (4 attempts in total) with jittered exponential backoff, honouring Retry-After
+        # allowed_methods covers GETs only, so read errors never replay a POST; _NylasRetry limits POSTs to statuses where nothing was created
+        retry = _NylasRetry(
+            total=3,
+            backoff_factor=0.3,
+            backoff_jitter=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods={"GET"},
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry))
 
     def get_calendars(self) -> List[Dict]:
         # Fetches all calendars associated with the grant ID
         url = f'https://api.us.nylas.com/v3/grants/{self.grant_id}/calendars'
-        response = requests.get(url, headers=self._get_headers())
-        return response.json()
+        response = self._session.get(url)
+        return _json.loads(response.content)
 
     def get_events(self, calendar_id: str, limit=5) -> List[Dict]:
         # Fetches the latest events from a specific calendar
-        url = f'https://api.us.nylas.com/v3/grants/{self.grant_id}/events?calendar_id={calendar_id}&limit={limit}'
-        response = requests.get(url, headers=self._get_headers())
-        return response.json()
+        url = f'https://api.us.nylas.com/v3/grants/{self.grant_id}/events'
+        response = self._session.get(url, params={'calendar_id': calendar_id, 'limit': limit})
+        return _json.loads(response.content)
 
     def create_event(self, calendar_id: str, event_data: Dict) -> Dict:
         # Creates a new event in the specified calendar
-        url = f'https://api.us.nylas.com/v3/grants/{self.grant_id}/events?calendar_id={calendar_id}'
-        response = requests.post(url, headers=self._get_headers(), data=json.dumps(event_data))
-        return response.json()
+        return _json.loads(self.post_event(calendar_id, event_data).content)
+
+    def post_event(self, calendar_id: str, event_data: Dict) -> requests.Response:
+        # Same request as create_event, returning the raw response for callers that need the status code
+        url = f'https://api.us.nylas.com/v3/grants/{self.grant_id}/events'
+        return self._session.post(url, params={'calendar_id': calendar_id}, data=_json.dumps(event_data))
+
+# Participant model for a single attendee extracted by OpenAI; the email is validated later so one bad address doesn't fail the whole parse
+class Participant(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    email: Optional[str]
 
 # CalendarEvent model for storing event details, used in parsing responses from OpenAI
+# extra="forbid" makes the generated JSON schema usable as a strict structured-output schema
 class CalendarEvent(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     title: str
     description: str
     when: str
+    end_time: Optional[str]
     location: str
-    participants: list[str]
+    participants: list[Participant]
+
+# IndexedCalendarEvent model pairs a batched event with the number of the description it was extracted from
+class IndexedCalendarEvent(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    index: int
+    event: CalendarEvent
+
+# CalendarEventBatch model for parsing several numbered descriptions in one OpenAI request, one indexed event per description
+class CalendarEventBatch(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    events: list[IndexedCalendarEvent]
+
+# Parsed descriptions are reused for this many seconds; beyond that, relative phrases like "tomorrow" may resolve differently
+_PARSE_CACHE_TTL = 300
+_PARSE_CACHE_SIZE = 256
+
+# System prompt for event extraction; it contains no per-call data so it is byte-identical across requests and OpenAI's prompt prefix cache can be reused
+_EVENT_SYSTEM_PROMPT = (
+    "Extract the event details based on the following structure: title, description, when, end_time, location, and participants. "
+    "The current date and time is given at the start of the user message. "
+    "Please ensure WHEN is a date or time description that can be converted into a standard date format. Put some details in the title. "
+    "END_TIME is the end of the event in the format YYYY-MM-DD HH:MM:SS; if it is not explicitly mentioned, calculate it from the start time and the duration mentioned in the description, and set it to null if neither is available. "
+    "PARTICIPANTS is a list of every person taking part, each with a name and an email; set the email to null if it is not available. "
+    "Other missing parts fill with 'unknown'.\n"
+    "For example:\n"
+    "- If the input is \"Alice will attend the meeting\", participants is [{\"name\": \"Alice\", \"email\": null}].\n"
+    "- If the input is \"Alice (alice@example.com) and Bob will attend the meeting\", participants is [{\"name\": \"Alice\", \"email\": \"alice@example.com\"}, {\"name\": \"Bob\", \"email\": null}].\n"
+    "- If the current date is 2023-09-15 and the input is \"The meeting will start at 3 PM and end at 4 PM\", end_time is \"2023-09-15 16:00:00\".\n"
+    "- If the current time is 2023-09-15 14:00:00 and the input is \"The meeting starts now and will last for 2 hours\", end_time is \"2023-09-15 16:00:00\"."
+)
+
+# Extra instruction appended to the system prompt when several descriptions are sent together
+_BATCHED_EVENTS_PROMPT = (
+    _EVENT_SYSTEM_PROMPT + "\n"
+    "The user message contains several numbered event descriptions. "
+    "Return one entry per numbered description, in the same order, in the events list, with index set to the number of the description."
+)
+
+# Structured-output response format built once at import time rather than regenerating the JSON schema from the model on every request
+_CALENDAR_EVENT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "CalendarEvent", "schema": CalendarEvent.model_json_schema(), "strict": True}
+}
+_CALENDAR_EVENT_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "CalendarEventBatch", "schema": CalendarEventBatch.model_json_schema(), "strict": True}
+}
 
-# OpenAIClient class handles interactions with the OpenAI API, such as extracting event details and participants
+# OpenAIClient class handles interactions with the OpenAI API, extracting event details, participants and end time in a single request
 class OpenAIClient:
     def __init__(self, timezone: str):
+        # openai is imported lazily to keep module import cheap
+        from openai import OpenAI
         self.client = OpenAI()
         self.timezone = timezone
+        self._tz = ZoneInfo(timezone)
+        # Recent parse results keyed by a digest of the description, each stored with the monotonic time it was parsed
+        self._parse_cache: Dict[bytes, Tuple[float, CalendarEvent]] = {}
+        # run_batch shares one client across worker threads, so cache reads and evictions are serialized
+        self._parse_cache_lock = threading.Lock()
 
-    def parse_event_description(self, description: str) -> Dict:
-        user_tz = pytz.timezone(self.timezone)
-        current_time = datetime.now(user_tz).strftime("%Y-%m-%d %H:%M:%S")
-        # Parses the event description to extract structured event details using OpenAI
-        system_message = f"Extract the event details based on the following structure: title, description, when, location, and participants. The current date and time is {current_time}. Please ensure WHEN is a date or time description that can be converted into a standard date format. Put some details in the title. Missing parts fill with 'unknown'."
-        completion = self.client.beta.chat.completions.parse(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": description},
-            ],
-            response_format=CalendarEvent
-        )
-        return json.loads(completion.choices[0].message.content)
-
-    def extract_participants(self, description: str) -> str:
-        # Extracts participants' names and emails from the event description using OpenAI
-        prompt = f"""
-            Extract the participants' names and emails from the following event description. Return the result as a json of dictionaries, where each dictionary contains a "name" as a key and an "email" as a value. If the email is not available, set the value of "email" to None.
-            For example:
-            - If the input is "Alice will attend the meeting", return {{\"participants\": [{{\"name\": \"Alice\", \"email\": null}}]}}.
-            - If the input is "Alice (alice@example.com) and Bob will attend the meeting", return {{\"participants\": [{{\"name\": \"Alice\", \"email\": \"alice@example.com\"}}, {{\"name\": \"Bob\", \"email\": null}}]}}.
-        """
+    def current_time(self) -> str:
+        # The current time in the user's timezone, in the format embedded in prompts
+        return datetime.now(self._tz).strftime("%Y-%m-%d %H:%M:%S")
+
+    def _build_messages(self, description: str, current_time: str, system_prompt: str = _EVENT_SYSTEM_PROMPT) -> List[Dict[str, str]]:
+        # The current time goes in the user message so the system prompt stays a cacheable prefix
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Current time: {current_time}\n\n{description}"},
+        ]
 
-        response = self.client.chat.completions.create(
+    def parse_event_description(self, description: str, current_time: Optional[str] = None) -> CalendarEvent:
+        _check_description(description)
+        current_time = current_time or self.current_time()
+        # Returns a recent result for the same description and date instead of calling OpenAI again; relative phrases such as
+        # "tomorrow" resolve differently on another date, so the date prefix of current_time is part of the key
+        key = hashlib.blake2b(f"{current_time[:10]}\0{description}".encode(), digest_size=16).digest()
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _PARSE_CACHE_TTL:
+            return cached[1]
+        parsed_event = self._parse_event_description(description, current_time)
+        self._cache_parsed_event(key, parsed_event)
+        return parsed_event
+
+    def _cache_parsed_event(self, key: bytes, parsed_event: CalendarEvent) -> None:
+        with self._parse_cache_lock:
+            now = time.monotonic()
+            if len(self._parse_cache) >= _PARSE_CACHE_SIZE:
+                self._parse_cache = {k: v for k, v in self._parse_cache.items() if now - v[0] < _PARSE_CACHE_TTL}
+                if len(self._parse_cache) >= _PARSE_CACHE_SIZE:
+                    # Entries are in insertion order, so the first one is the oldest
+                    del self._parse_cache[next(iter(self._parse_cache))]
+            self._parse_cache[key] = (now, parsed_event)
+
+    def _parse_event_description(self, description: str, current_time: str) -> CalendarEvent:
+        # Parses the event description to extract structured event details, participants and end time using a single OpenAI call
+        completion = self.client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": description}
-            ],
-            response_format={"type": "json_object"}
+            messages=self._build_messages(description, current_time),
+            response_format=_CALENDAR_EVENT_RESPONSE_FORMAT,
+            temperature=0
         )
-        return response.choices[0].message.content
-    
-    def extract_event_end_time(self, description: str) -> str:
-        user_tz = pytz.timezone(self.timezone)
-        current_time = datetime.now(user_tz).strftime("%Y-%m-%d %H:%M:%S")
-        # Extract the end time, or provide an end time based on the current time and duration
-        prompt = f"""
-            Extract the end time from the following event description. The current date and time is {current_time}. 
-            If the end time is not explicitly mentioned, try to calculate it based on the current time and the duration mentioned in the description. 
-            Return the result as a string in the JSON format {{"end_time": "YYYY-MM-DD HH:MM:SS"}}.
-            If can't get the end time, return 'unknow'.
-            For example:
-            - If the input is "The current date is 2023-09-15. The meeting will start at 3 PM and end at 4 PM", return {{"end_time": "2023-09-15 16:00:00"}}.
-            - If the input is "The meeting will last for 2 hours", and the current time is "2023-09-15 14:00:00", return {{"end_time": "2023-09-15 16:00:00"}}.
-        """
-        
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": description}
-            ],
-            response_format={"type": "json_object"}
+        # Validate the JSON content straight into a CalendarEvent, without an intermediate dict
+        message = completion.choices[0].message
+        if not message.content:
+            raise ValueError(f"OpenAI did not return event details: {message.refusal}")
+        return CalendarEvent.model_validate_json(message.content)
+
+    def parse_event_descriptions_batched(self, descriptions: List[str], batch_size: int = 8, current_time: Optional[str] = None) -> List[Optional[CalendarEvent]]:
+        # Sends batch_size descriptions per OpenAI request to amortize the fixed per-request overhead; returns events aligned with the input
+        # Larger chunks get slower per request, so batch_size should be tuned rather than maximized
+        current_time = current_time or self.current_time()
+        # Validate everything before the first request, so a bad input doesn't waste chunks already paid for; invalid entries come back as None
+        events: List[Optional[CalendarEvent]] = [None] * len(descriptions)
+        valid = []
+        for index, description in enumerate(descriptions):
+            try:
+                _check_description(description)
+            except ValueError as e:
+                print(f"Warning: Skipping description {index}: {e}")
+                continue
+            valid.append((index, description))
+
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            numbered = "\n\n".join(f"{number}. {description.strip()}" for number, (_, description) in enumerate(chunk, 1))
+            completion = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=self._build_messages(numbered, current_time, _BATCHED_EVENTS_PROMPT),
+                response_format=_CALENDAR_EVENT_BATCH_RESPONSE_FORMAT,
+                temperature=0
+            )
+            # Results are aligned on their index rather than their position, so a reordered answer isn't attached to the wrong descriptions
+            by_number = {}
+            choice = completion.choices[0]
+            if choice.message.content and choice.finish_reason != "length":
+                try:
+                    by_number = {e.index: e.event for e in CalendarEventBatch.model_validate_json(choice.message.content).events}
+                except ValueError as e:
+                    print(f"Warning: Could not parse batched events: {e}")
+            if sorted(by_number) == list(range(1, len(chunk) + 1)):
+                chunk_events = [by_number[number] for number in range(1, len(chunk) + 1)]
+            else:
+                # The results are missing, truncated or can't be aligned with the inputs, so parse this chunk one description at a time
+                chunk_events = []
+                for _, description in chunk:
+                    try:
+                        chunk_events.append(self.parse_event_description(description, current_time))
+                    except ValueError as e:
+                        print(f"Warning: Could not parse event description: {e}")
+                        chunk_events.append(None)
+            for (index, _), event in zip(chunk, chunk_events):
+                events[index] = event
+        return events
+
+    def submit_batch(self, descriptions: List[str], current_time: Optional[str] = None) -> str:
+        # Submits one request per description to the OpenAI Batch API, which is billed at half price and completes within 24 hours, and returns the batch id
+        # Invalid descriptions are skipped; custom_id keeps the original index, so their slots come back as None from poll_batch
+        current_time = current_time or self.current_time()
+        submitted = 0
+        # Requests are spooled to a temporary JSONL file as they are built rather than held in memory together
+        with tempfile.TemporaryFile() as batch_input:
+            for index, description in enumerate(descriptions):
+                try:
+                    _check_description(description)
+                except ValueError as e:
+                    print(f"Warning: Skipping description {index}: {e}")
+                    continue
+                submitted += 1
+                batch_input.write(_json_bytes({
+                    "custom_id": f"event-{index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": "gpt-4o-mini",
+                        "messages": self._build_messages(description, current_time),
+                        "response_format": _CALENDAR_EVENT_RESPONSE_FORMAT,
+                        "temperature": 0
+                    }
+                }) + b"\n")
+            if not submitted:
+                raise ValueError("No valid event descriptions to submit")
+            batch_input.seek(0)
+            batch_file = self.client.files.create(file=("events.jsonl", batch_input), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"descriptions": str(len(descriptions))}
         )
-        return response.choices[0].message.content
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[List[Optional[CalendarEvent]]]:
+        # Returns None while the batch is still running, otherwise the parsed events in submission order with None for failed requests
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status == "failed":
+            raise RuntimeError(f"OpenAI batch {batch_id} ended with status {batch.status}")
+        if batch.status in ("expired", "cancelled"):
+            # Requests that finished before the batch expired or was cancelled are still in the output file (and billed), so keep them
+            if not batch.output_file_id:
+                raise RuntimeError(f"OpenAI batch {batch_id} ended with status {batch.status} and no output")
+            print(f"Warning: OpenAI batch {batch_id} ended with status {batch.status}; unfinished requests come back as None")
+        elif batch.status != "completed":
+            return None
+
+        # Size the result by the number of descriptions given to submit_batch, which includes the skipped ones
+        count = (batch.metadata or {}).get("descriptions")
+        events = [None] * (int(count) if count else batch.request_counts.total)
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                result = _json.loads(line)
+                index = int(result["custom_id"].rsplit("-", 1)[1])
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                content = response["body"]["choices"][0]["message"].get("content")
+                if not content:
+                    continue
+                try:
+                    events[index] = CalendarEvent.model_validate_json(content)
+                except ValueError as e:
+                    print(f"Warning: Could not parse batch result {index}: {e}")
+        return events
+
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 30) -> List[Optional[CalendarEvent]]:
+        # Polls the batch until it completes
+        events = self.poll_batch(batch_id)
+        while events is None:
+            time.sleep(poll_interval)
+            events = self.poll_batch(batch_id)
+        return events
 
 # CalendarEventProcessor class processes event data and manages participants
 class CalendarEventProcessor:
@@ -122,22 +405,20 @@ class CalendarEventProcessor:
         self.api_client = api_client
         self.openai_client = openai_client
         self.timezone = timezone
+        self._tz = ZoneInfo(timezone)
 
     def standardize_time(self, time_str: str) -> int:
         # Converts a natural language time string into a standardized Unix timestamp in the specified timezone
-        parsed_time = parser.parse(time_str, fuzzy=True)
-        user_tz = pytz.timezone(self.timezone)
-        user_time = user_tz.localize(parsed_time)
-        utc_time = user_time.astimezone(pytz.utc)
-        return int(utc_time.timestamp())
-
-    def process_start_time(self, parsed_event: Dict):
-        start_time = self.standardize_time(parsed_event['when'])
+        return _standardize_time(time_str, self._tz, datetime.now(self._tz).date())
+
+    def process_start_time(self, parsed_event: CalendarEvent):
+        start_time = self.standardize_time(parsed_event.when)
         return start_time
     
-    def process_end_time(self, description: str, start_time: int) -> int:
-        end_time_str = self.openai_client.extract_event_end_time(description)
-        if end_time_str.lower() != 'unknown':
+    def process_end_time(self, parsed_event: CalendarEvent, start_time: int) -> int:
+        # Converts the extracted end time into a timestamp, defaulting to one hour after the start
+        end_time_str = parsed_event.end_time
+        if end_time_str and end_time_str.strip().lower() != 'unknown':
             try:
                 end_time_timestamp = self.standardize_time(end_time_str)
                 return end_time_timestamp
@@ -147,53 +428,53 @@ class CalendarEventProcessor:
         else:
             return start_time + 3600
 
-    def process_participants(self, participants_json: str) -> (Dict[str, str], List[str]):
-        # Processes participants JSON to extract emails and identify participants without valid emails
+    def process_participants(self, participants: List[Participant]) -> (List[Dict[str, str]], List[str]):
+        # Processes the extracted participants into the Nylas participant format and identifies participants without valid emails
         try:
-            data = json.loads(participants_json)
-            participants = data["participants"]
-            emails_dict = {}
+            participants_with_email = []
             names_without_valid_email = []
             for participant in participants:
-                name = participant["name"]
-                email = participant.get("email")
-                if email and EmailStr._validate(email):
-                    emails_dict[name] = email
+                name = participant.name
+                email = participant.email
+                if email and _EMAIL_RE.match(email):
+                    participants_with_email.append({"name": name, "email": email})
                 else:
                     names_without_valid_email.append(name)
-            return emails_dict, names_without_valid_email
-        except json.JSONDecodeError:
-            raise ValueError("Failed to parse JSON string")
+            return participants_with_email, names_without_valid_email
         except Exception as e:
             raise ValueError(f"Error processing participants: {e}")
 
-    def build_event_data(self, parsed_event: Dict, emails_dict: Dict[str, str], start_time: int, end_time: int) -> Dict:
+    def build_event_data(self, parsed_event: CalendarEvent, participants: List[Dict[str, str]], start_time: int, end_time: int) -> Dict:
         # Constructs the final event data dictionary for creating a new event in the calendar
-        participants = [{"name": name, "email": email} for name, email in emails_dict.items()]
         event_data = {
-            "title": parsed_event['title'],
+            "title": parsed_event.title,
             "status": "confirmed",
             "busy": True,
             "participants": participants,
-            "description": parsed_event['description'],
+            "description": parsed_event.description,
             "when": {
                 "object": "timespan",
                 "start_time": start_time,
                 "end_time": end_time
             },
-            "location": parsed_event['location']
+            "location": parsed_event.location
         }
         return event_data
 
 class ICSGenerator:
-    def __init__(self):
+    def __init__(self, timezone: str = 'UTC'):
+        # ics pulls in arrow, so it is only imported once an ICS file is actually being built
+        import ics
         self.calendar = ics.Calendar()
+        # Event times are written in this timezone so DTSTART/DTEND don't depend on the machine's local time
+        self._tz = ZoneInfo(timezone)
 
     def add_event(self, event_data):
+        import ics
         event = ics.Event()
         event.name = event_data['title']
-        event.begin = datetime.fromtimestamp(event_data['when']['start_time'])
-        event.end = datetime.fromtimestamp(event_data['when']['end_time'])
+        event.begin = datetime.fromtimestamp(event_data['when']['start_time'], tz=self._tz)
+        event.end = datetime.fromtimestamp(event_data['when']['end_time'], tz=self._tz)
         event.description = event_data['description']
         event.location = event_data['location']
         
@@ -203,44 +484,137 @@ class ICSGenerator:
         self.calendar.events.add(event)
 
     def generate_ics_file(self, filename):
-        with open(filename, 'w') as f:
-            f.writelines(self.calendar)
+        # Write the serialized calendar chunk by chunk through a large buffer; newline='' keeps the CRLF line endings ICS requires
+        with open(filename, 'w', buffering=1 << 16, newline='') as f:
+            for chunk in self.calendar.serialize_iter():
+                f.write(chunk)
         print(f"ICS file generated: {filename}")
 
     def clear_calendar(self):
+        import ics
         self.calendar = ics.Calendar()
 
+# 4xx statuses after which resending the same event data may still succeed; any other 4xx means Nylas rejected the payload itself
+_RETRYABLE_CLIENT_STATUSES = frozenset({408, 429})
+
 # CalendarManager class integrates NylasAPI and CalendarEventProcessor to manage the overall process
 class CalendarManager:
-    def __init__(self, api_client: NylasAPI, event_processor: CalendarEventProcessor, timezone: str = 'America/Los_Angeles'):
+    def __init__(self, api_client: NylasAPI, event_processor: CalendarEventProcessor, timezone: str = 'America/Los_Angeles', checkpoint_dir: Optional[str] = None):
         self.api_client = api_client
         self.event_processor = event_processor
         self.timezone = timezone
+        # When set, event data built from a description is saved here until Nylas accepts it, so a failed run can skip the OpenAI stage on retry
+        self.checkpoint_dir = checkpoint_dir
     
     def readable_event(self, event_data):
         # Extract relevant information
-        title = event_data['data']['title']
-        participants = [(p['name'], p['email']) for p in event_data['data']['participants']]
-        start_time = datetime.fromtimestamp(event_data['data']['when']['start_time']).strftime('%Y-%m-%d %H:%M:%S')
-        location = event_data['data']['location']
-        description = event_data['data']['description']
+        data = event_data['data']
+        participant_lines = "\n".join(f"  Name: {p['name']}, Email: {p['email']}" for p in data['participants'])
+        start_time = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(data['when']['start_time']))
 
         # Format the output
-        output = f"Title: {title}\n" \
-                 f"Participants:\n" + "\n".join([f"  Name: {name}, Email: {email}" for name, email in participants]) + "\n" \
-                 f"Start Time (UTC): {start_time}\n" \
-                 f"Location: {location}\n" \
-                 f"Description: {description}"
-        
-        return output
+        return (
+            f"Title: {data['title']}\n"
+            f"Participants:\n{participant_lines}\n"
+            f"Start Time (UTC): {start_time}\n"
+            f"Location: {data['location']}\n"
+            f"Description: {data['description']}"
+        )
+
+    def build_event_from_parsed(self, parsed_event: CalendarEvent) -> Dict:
+        # Process participants from the event description
+        participants, no_emails = self.event_processor.process_participants(parsed_event.participants)
+        # Process start and end time
+        start_time = self.event_processor.process_start_time(parsed_event)
+        end_time = self.event_processor.process_end_time(parsed_event, start_time)
+
+        # Build the event data
+        return self.event_processor.build_event_data(parsed_event, participants, start_time, end_time)
+
+    def create_event_from_parsed(self, parsed_event: CalendarEvent, calendar_id: str) -> Dict:
+        event_data = self.build_event_from_parsed(parsed_event)
+        return self.api_client.create_event(calendar_id=calendar_id, event_data=event_data)
+
+    def _checkpoint_path(self, description: str, current_time: str) -> Optional[str]:
+        # Relative phrases like "tomorrow" were resolved against the date of current_time, so checkpoints from another date are never picked up
+        if not self.checkpoint_dir:
+            return None
+        day = current_time[:10]
+        digest = hashlib.sha256(f"{day}\0{description}".encode()).hexdigest()[:16]
+        return os.path.join(self.checkpoint_dir, f"{day}-{digest}.json")
+
+    def create_event_from_description(self, description: str, calendar_id: str, current_time: Optional[str] = None) -> Dict:
+        # Reuse checkpointed event data from an earlier failed attempt on the same date instead of calling OpenAI again
+        current_time = current_time or self.event_processor.openai_client.current_time()
+        checkpoint = self._checkpoint_path(description, current_time)
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint, 'rb') as f:
+                event_data = _json.loads(f.read())
+        else:
+            # Parse the event description, participants and end time using a single OpenAI call
+            parsed_event = self.event_processor.openai_client.parse_event_description(description, current_time)
+            event_data = self.build_event_from_parsed(parsed_event)
+            if checkpoint:
+                os.makedirs(self.checkpoint_dir, exist_ok=True)
+                # Write to a temporary file and rename it into place, so a concurrent reader never sees a partly written checkpoint
+                with tempfile.NamedTemporaryFile('wb', dir=self.checkpoint_dir, suffix='.tmp', delete=False) as f:
+                    f.write(_json_bytes(event_data))
+                os.replace(f.name, checkpoint)
+
+        response = self.api_client.post_event(calendar_id=calendar_id, event_data=event_data)
+        new_event = _json.loads(response.content)
+        # The checkpoint is only kept for failures worth retrying; a payload Nylas rejected would otherwise be replayed on every run
+        rejected = 400 <= response.status_code < 500 and response.status_code not in _RETRYABLE_CLIENT_STATUSES
+        if checkpoint and ('data' in new_event or rejected):
+            # Duplicate descriptions in one run share a checkpoint, so another worker may already have removed it
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(checkpoint)
+        return new_event
+
+    def run_batch(self, descriptions: List[str], calendar_id: str, max_workers: int = 10, bulk: bool = False) -> List[Optional[Dict]]:
+        # Runs the per-description pipeline concurrently, since it is dominated by OpenAI and Nylas I/O; max_workers bounds the number of requests in flight
+        # With bulk=True the descriptions go through the OpenAI Batch API instead, for non-interactive runs that can wait up to 24 hours at half the cost
+        # Results keep the input order, with None for descriptions that failed
+        if bulk:
+            return self.process_batch(descriptions, calendar_id)
+        now_str = self.event_processor.openai_client.current_time()
+
+        def create(description: str) -> Optional[Dict]:
+            try:
+                return self.create_event_from_description(description, calendar_id, current_time=now_str)
+            except Exception as e:
+                print(f"Warning: Error creating event from description: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(create, descriptions))
+
+    def process_batch(self, descriptions: List[str], calendar_id: str, poll_interval: float = 30) -> List[Optional[Dict]]:
+        # Non-interactive workflow: parses all descriptions through the OpenAI Batch API, then creates an event for each one that parsed
+        openai_client = self.event_processor.openai_client
+        try:
+            batch_id = openai_client.submit_batch(descriptions, current_time=openai_client.current_time())
+        except ValueError as e:
+            # Nothing was valid enough to submit, so every slot fails
+            print(f"Warning: {e}")
+            return [None] * len(descriptions)
+        parsed_events = openai_client.wait_for_batch(batch_id, poll_interval)
+
+        # One event that can't be created (e.g. an unparseable 'when') must not drop the rest of a batch that may have taken hours
+        new_events = []
+        for parsed_event in parsed_events:
+            if parsed_event is None:
+                new_events.append(None)
+                continue
+            try:
+                new_events.append(self.create_event_from_parsed(parsed_event, calendar_id))
+            except Exception as e:
+                print(f"Warning: Error creating event from batch result: {e}")
+                new_events.append(None)
+        return new_events
 
     def run_test(self):
         # Example method to demonstrate the workflow: retrieving calendars, processing events, and creating a new event
-        calendars = self.api_client.get_calendars()
-        print("Calendars:", calendars)
-        events = self.api_client.get_events(calendar_id="brandon.ch.thu@gmail.com", limit=5)
-        print("Events:", events)
-
         # Example event description for testing
         description = f"""
             John Smith invites you and Sarah Johnson to join the group chat "TechInnovate-VCF"
@@ -255,18 +629,18 @@ class CalendarManager:
             Sarah Johnson: sjohnson@vcfinvest.com
         """
         
-        # Parse the event description using OpenAI
-        parsed_event = self.event_processor.openai_client.parse_event_description(description)
-        # Extract and process participants from the event description
-        extracted_participants_raw = self.event_processor.openai_client.extract_participants(description)
-        emails, no_emails = self.event_processor.process_participants(extracted_participants_raw)
-        # Extract start and end time
-        start_time = self.event_processor.process_start_time(parsed_event)
-        end_time = self.event_processor.process_end_time(description, start_time)
+        # Compute the current time once so every prompt built for this run carries the same timestamp
+        # It comes from the OpenAI client so it is in the same timezone the extracted times are interpreted in
+        now_str = self.event_processor.openai_client.current_time()
 
-        # Build the event data and create the new event
-        event_data = self.event_processor.build_event_data(parsed_event, emails, start_time, end_time)
-        new_event = self.api_client.create_event(calendar_id="brandon.ch.thu@gmail.com", event_data=event_data)
+        # Listing calendars and events doesn't depend on the new event, so overlap those Nylas calls with the OpenAI parse
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            calendars_future = executor.submit(self.api_client.get_calendars)
+            events_future = executor.submit(self.api_client.get_events, calendar_id="brandon.ch.thu@gmail.com", limit=5)
+            new_event_future = executor.submit(self.create_event_from_description, description, calendar_id="brandon.ch.thu@gmail.com", current_time=now_str)
+        print("Calendars:", calendars_future.result())
+        print("Events:", events_future.result())
+        new_event = new_event_future.result()
         print("New Event:", new_event)
 
         # Format the event readable details and print